@@ -2,10 +2,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import altair as alt
-from fpdf import FPDF
 from io import BytesIO
 import os
+import tempfile
 from datetime import datetime
 
 # --- 2. PAGE CONFIG (MUST BE THE FIRST STREAMLIT COMMAND) ---
@@ -35,24 +34,40 @@ if not st.session_state.authenticated:
     st.stop()  # Stop execution if not authenticated
 
 # --- 4. DATA LOADING (ONLY ONCE) ---
-@st.cache_data  # Cache the data for performance
+def read_economic_data(csv_path, parquet_path):
+    # Read the Parquet copy when it is at least as new as the CSV; it stores
+    # 'Date' as datetime64, so cold loads skip text parsing entirely.
+    # An unreadable copy (corrupt file, pyarrow missing) falls through to the CSV.
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            pass
+    df = pd.read_csv(csv_path, parse_dates=['Date'])
+    # Write to a temp file and swap it in, so an interrupted write never leaves
+    # a truncated Parquet file behind. If Data/ is not writable, just use the CSV.
+    # The .parquet suffix keeps stray temp files under the Data/*.parquet ignore rule.
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".parquet", dir=os.path.dirname(parquet_path))
+        os.close(fd)
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+# Shared across sessions without pickling; callers must treat df as read-only
+@st.cache_resource(ttl=None, show_spinner=False)
 def load_data():
     # This creates a path relative to this .py file
     base_dir = os.path.dirname(os.path.abspath(__file__))
     file_path = os.path.join(base_dir, "Data", "Economic Data.csv")
-    
-    # --- INDENTATION FIXED BELOW ---
+    parquet_path = os.path.join(base_dir, "Data", "Economic Data.parquet")
+
     try:
-        df = pd.read_csv(file_path)
-        
-        # --- CORRECT FIX ---
-        # First, check if the column exists
-        if 'Date' in df.columns:
-            # If it exists, THEN convert it
-            df['Date'] = pd.to_datetime(df['Date'])
-        # --- END OF FIX ---
-        
-        return df
+        return read_economic_data(file_path, parquet_path)
 
     except FileNotFoundError:
         st.error(f"Error: The data file was not found.")
@@ -61,7 +76,6 @@ def load_data():
     except Exception as e:
         st.error(f"An error occurred while loading data: {e}")
         return None
-    # --- END OF INDENTATION FIX ---
 
 # Load the data
 df = load_data()
@@ -71,10 +85,44 @@ if df is None or df.empty:
     st.error("Data could not be loaded. App cannot continue.")
     st.stop()
 
+NUMERIC_FILTER = [np.number]
+INDICATOR_COLS = ['GDP Growth (%)', 'Inflation Rate (%)', 'Unemployment Rate (%)', 'Interest Rate (%)']
+
+# Every static view of the dataframe (metadata, formatted dates, lookups, summaries)
+# in one dict, built once per loaded frame. The leading underscore stops Streamlit
+# from hashing the frame; df_id keys the cache. Callers must not mutate the results.
+@st.cache_resource(show_spinner=False)
+def df_meta(_df, df_id):
+    date_strs = _df['Date'].dt.strftime('%Y-%m-%d').tolist()
+    # Dates repeat across indexes, so the first row for a date wins
+    # (same as the old boolean filter).
+    date_to_pos = {}
+    for i, d in enumerate(date_strs):
+        date_to_pos.setdefault(d, i)
+    return {
+        'numeric_cols': _df.select_dtypes(include=NUMERIC_FILTER).columns.tolist(),
+        'date_strs': date_strs,
+        'date_to_pos': date_to_pos,
+        # NumPy columns for Tab 2, indexed by date_to_pos positions
+        'indicators': {col: _df[col].to_numpy() for col in INDICATOR_COLS},
+        'latest': _df.iloc[-1][INDICATOR_COLS].astype(float).to_dict(),
+        'describe': _df.describe(),
+        'head': _df.head(),
+    }
+
+meta = df_meta(df, id(df))
+date_options = meta['date_strs']
+date_to_pos = meta['date_to_pos']
+indicator_arrays = meta['indicators']
+latest_data = meta['latest']
+
 # --- 5. STYLING & TITLE ---
 # (Your custom CSS)
-st.markdown(
-    """
+# Shared across sessions via cache_resource. Still emitted on every rerun,
+# because Streamlit removes any element a rerun does not write again.
+@st.cache_resource(show_spinner=False)
+def app_css():
+    return """
     <style>
     html, body, [class*="css"] {
         background-color: #f4f4f4 !important;
@@ -99,16 +147,16 @@ st.markdown(
         border-right: 1px solid #cccccc;
     }
     </style>
-    """,
-    unsafe_allow_html=True
-)
-
-st.markdown(
     """
+
+@st.cache_resource(show_spinner=False)
+def app_title_html():
+    return """
     <h1 style='text-align: center; color: #2e2e2e;'>📊 AI Personal Finance Advisor</h1>
-    """,
-    unsafe_allow_html=True
-)
+    """
+
+st.markdown(app_css(), unsafe_allow_html=True)
+st.markdown(app_title_html(), unsafe_allow_html=True)
 
 # --- 6. SIDEBAR CONTROLS ---
 st.sidebar.header("🎯 Your Financial Goal")
@@ -118,65 +166,136 @@ goal = st.sidebar.selectbox(
 )
 
 st.sidebar.header("🗓️ Select Date for Analysis")
-date_options = df['Date'].dt.strftime('%Y-%m-%d').tolist()
 selected_date_str = st.sidebar.selectbox("Choose Date", options=date_options, index=len(date_options)-1)
-selected_date = pd.to_datetime(selected_date_str)
 
 st.sidebar.header("🔮 Economic Scenario Simulation")
-st.sidebar.caption("Simulate conditions to see suggestions change.")
-# Get default values from the latest data
-latest_data = df.iloc[-1]
-sim_gdp = st.sidebar.slider("Simulated GDP Growth (%)", -5.0, 15.0, float(latest_data["GDP Growth (%)"]))
-sim_inflation = st.sidebar.slider("Simulated Inflation Rate (%)", 0.0, 15.0, float(latest_data["Inflation Rate (%)"]))
-sim_unemployment = st.sidebar.slider("Simulated Unemployment Rate (%)", 0.0, 15.0, float(latest_data["Unemployment Rate (%)"]))
-sim_interest = st.sidebar.slider("Simulated Interest Rate (%)", 0.0, 15.0, float(latest_data["Interest Rate (%)"]))
+st.sidebar.caption("Simulate conditions, then click Apply Scenario to see suggestions change.")
+# Sliders sit in a form so the app reruns once per Apply, not on every drag.
+# Default values come from the latest data (precomputed above)
+with st.sidebar.form("sim_form"):
+    sim_gdp = st.slider("Simulated GDP Growth (%)", -5.0, 15.0, latest_data["GDP Growth (%)"])
+    sim_inflation = st.slider("Simulated Inflation Rate (%)", 0.0, 15.0, latest_data["Inflation Rate (%)"])
+    sim_unemployment = st.slider("Simulated Unemployment Rate (%)", 0.0, 15.0, latest_data["Unemployment Rate (%)"])
+    sim_interest = st.slider("Simulated Interest Rate (%)", 0.0, 15.0, latest_data["Interest Rate (%)"])
+    st.form_submit_button("Apply Scenario")
 
 
 # --- 7. HELPER FUNCTIONS ---
 
-# Function for goal-based suggestions
-def generate_suggestions(goal, gdp, inflation, unemployment, interest_rate):
-    suggestions = []
-    # Retirement
-    if goal == "Retirement":
-        suggestions.append("💼 Contribute regularly to retirement accounts (e.g., 401(k), IRA).")
-        if inflation > 4:
-            suggestions.append("🛡️ Use inflation-protected assets like TIPS and dividend-paying stocks.")
-        else:
-            suggestions.append("📈 Consider a balanced mix of stocks and bonds.")
-    # Buying a Home
-    elif goal == "Buying a Home":
-        suggestions.append("🏠 Start or grow a high-yield savings account for your down payment.")
-        if interest_rate > 5:
-            suggestions.append("⏳ Mortgage rates are high—consider delaying purchase or locking rates now.")
-        else:
-            suggestions.append("✅ Low rates—evaluate mortgage options and affordability.")
-    # Wealth Growth
-    elif goal == "Wealth Growth":
-        suggestions.append("🚀 Focus on long-term growth assets like ETFs, tech stocks, or index funds.")
-        if gdp > 2 and inflation < 4:
-            suggestions.append("🌱 Strong economy supports aggressive growth investing.")
-        else:
-            suggestions.append("🔍 Diversify with stable sectors (e.g., healthcare, utilities) for balance.")
-    # Add other goals...
+# Goal-specific suggestion builders; each takes (gdp, inflation, unemployment, interest_rate)
+def retirement_tips(gdp, inflation, unemployment, interest_rate):
+    suggestions = ["💼 Contribute regularly to retirement accounts (e.g., 401(k), IRA)."]
+    if inflation > 4:
+        suggestions.append("🛡️ Use inflation-protected assets like TIPS and dividend-paying stocks.")
     else:
-        suggestions.append("Select a goal to see personalized tips.")
+        suggestions.append("📈 Consider a balanced mix of stocks and bonds.")
+    return suggestions
+
+def home_tips(gdp, inflation, unemployment, interest_rate):
+    suggestions = ["🏠 Start or grow a high-yield savings account for your down payment."]
+    if interest_rate > 5:
+        suggestions.append("⏳ Mortgage rates are high—consider delaying purchase or locking rates now.")
+    else:
+        suggestions.append("✅ Low rates—evaluate mortgage options and affordability.")
+    return suggestions
 
+def wealth_growth_tips(gdp, inflation, unemployment, interest_rate):
+    suggestions = ["🚀 Focus on long-term growth assets like ETFs, tech stocks, or index funds."]
+    if gdp > 2 and inflation < 4:
+        suggestions.append("🌱 Strong economy supports aggressive growth investing.")
+    else:
+        suggestions.append("🔍 Diversify with stable sectors (e.g., healthcare, utilities) for balance.")
     return suggestions
 
+def default_tips(gdp, inflation, unemployment, interest_rate):
+    return ["Select a goal to see personalized tips."]
+
+# Add other goals...
+GOAL_HANDLERS = {
+    "Retirement": retirement_tips,
+    "Buying a Home": home_tips,
+    "Wealth Growth": wealth_growth_tips,
+}
+
+# Function for goal-based suggestions
+@st.cache_data(show_spinner=False)
+def generate_suggestions(goal, gdp, inflation, unemployment, interest_rate):
+    return GOAL_HANDLERS.get(goal, default_tips)(gdp, inflation, unemployment, interest_rate)
+
 # Function for tax efficiency tips
-def tax_efficiency_tips(alloc_df):
+@st.cache_data(show_spinner=False)
+def tax_efficiency_tips(stocks, bonds, real_estate, cash):
+    # Plain dict lookups; classes the builder has no slider for yet are 0
+    alloc = {'Stocks': stocks, 'Bonds': bonds, 'Real Estate': real_estate, 'Municipal Bonds': 0, 'High Turnover Funds': 0, 'Cash': cash}
     tips = []
-    if 'Stocks' in alloc_df['Asset Class'].values and alloc_df.loc[alloc_df['Asset Class'] == 'Stocks', 'Allocation %'].values[0] > 50:
+    if alloc.get('Stocks', 0) > 50:
         tips.append("Consider holding stocks long-term (over 1 year) to benefit from lower capital gains tax rates.")
-    if 'Municipal Bonds' in alloc_df['Asset Class'].values and alloc_df.loc[alloc_df['Asset Class'] == 'Municipal Bonds', 'Allocation %'].values[0] > 0:
+    if alloc.get('Municipal Bonds', 0) > 0:
         tips.append("Municipal bonds generate tax-free income at the federal level. Good choice!")
-    if 'High Turnover Funds' in alloc_df['Asset Class'].values and alloc_df.loc[alloc_df['Asset Class'] == 'High Turnover Funds', 'Allocation %'].values[0] > 10:
+    if alloc.get('High Turnover Funds', 0) > 10:
         tips.append("Consider moving high-turnover funds to tax-advantaged accounts (like an IRA) to avoid annual tax drag.")
     if not tips:
         tips.append("Your portfolio looks tax-efficient. Remember to consult a tax professional.")
     return tips
 
+# The allocation table shown in the pie chart and written to the CSV download
+def allocation_table(stocks, bonds, real_estate, cash):
+    return pd.DataFrame({
+        "Asset Class": ["Stocks", "Bonds", "Real Estate", "Cash"],
+        "Allocation %": [stocks, bonds, real_estate, cash]
+    })
+
+# UTF-8 CSV bytes for the allocation download, cached per allocation
+@st.cache_data(show_spinner=False)
+def allocation_csv(stocks, bonds, real_estate, cash):
+    buffer = BytesIO()
+    allocation_table(stocks, bonds, real_estate, cash).to_csv(buffer, index=False, encoding="utf-8")
+    return buffer.getvalue()
+
+# Market risk level from economic indicators.
+# Works on scalars or whole columns (e.g. df['Inflation Rate (%)']), returning a str or an array.
+def compute_risk_level(inflation, unemployment, interest_rate):
+    inflation = np.asarray(inflation)
+    unemployment = np.asarray(unemployment)
+    interest_rate = np.asarray(interest_rate)
+    cond_high = (inflation > 5) | (unemployment > 8) | (interest_rate > 6)
+    cond_low = (inflation < 2) & (unemployment < 5) & (interest_rate < 3)
+    levels = np.select([cond_high, cond_low], ["High", "Low"], default="Moderate")
+    return levels.item() if levels.ndim == 0 else levels
+
+# Portfolio risk level from the allocation risk score (scalar or array)
+def compute_portfolio_risk_level(risk_score):
+    risk_score = np.asarray(risk_score)
+    levels = np.select([risk_score > 0.4, risk_score > 0.15], ["High", "Medium"], default="Low")
+    return levels.item() if levels.ndim == 0 else levels
+
+# Rule-based risk score, risk level, expected return and volatility for an allocation
+def portfolio_profile(stocks, bonds, real_estate, cash):
+    risk_score = (stocks * 0.6 + real_estate * 0.3 - bonds * 0.4 - cash * 0.5) / 100
+    risk_level = compute_portfolio_risk_level(risk_score)
+    expected_return = (stocks * 0.08 + bonds * 0.03 + real_estate * 0.06 + cash * 0.02) / 100
+    volatility = (stocks * 0.15 + bonds * 0.05 + real_estate * 0.1 + cash * 0.01) / 100
+    return risk_score, risk_level, expected_return, volatility
+
+# Only needed when the dataset has Ticker/Return columns, so kept out of df_meta
+@st.cache_resource(show_spinner=False)
+def top_tickers(_df, df_id):
+    return _df.groupby("Ticker", sort=False)['Return'].mean().nlargest(10)
+
+# Plain Vega-Lite spec for the allocation pie; skips building an Altair chart each rerun
+ALLOCATION_PIE_SPEC = {
+    "title": "Portfolio Allocation",
+    "mark": {"type": "arc", "outerRadius": 120},
+    "encoding": {
+        "theta": {"field": "Allocation %", "type": "quantitative"},
+        "color": {"field": "Asset Class", "type": "nominal"},
+        "tooltip": [
+            {"field": "Asset Class", "type": "nominal"},
+            {"field": "Allocation %", "type": "quantitative"}
+        ]
+    }
+}
+
 
 # --- 8. APP LAYOUT (USING TABS) ---
 tab1, tab2, tab3, tab4 = st.tabs(["📈 Economic Dashboard", "💡 Personalized Suggestions","📊 Portfolio Builder", "📋 Report & Feedback"])
@@ -184,14 +303,14 @@ tab1, tab2, tab3, tab4 = st.tabs(["📈 Economic Dashboard", "💡 Personalized
 # --- TAB 1: ECONOMIC DASHBOARD ---
 with tab1:
     st.subheader("Economic Data Preview")
-    st.dataframe(df.head())
+    st.dataframe(meta['head'])
 
     st.subheader("Summary Statistics")
-    st.write(df.describe())
+    st.write(meta['describe'])
 
     st.subheader("Visualize Economic Indicators")
     # Filter out non-numeric columns for selector
-    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+    numeric_cols = meta['numeric_cols']
     metric = st.selectbox("Select a metric to visualize:", numeric_cols)
     if metric:
         chart_df = df[['Date', metric]].dropna()
@@ -200,7 +319,7 @@ with tab1:
     # Top 5 Investment Suggestions (if columns exist)
     if 'Return' in df.columns and 'Ticker' in df.columns:
         st.subheader("💡 Top 10 Investment Suggestions (by Avg. Return)")
-        top_stocks = df.groupby("Ticker")['Return'].mean().sort_values(ascending=False).head(10)
+        top_stocks = top_tickers(df, id(df))
         st.table(top_stocks)
     else:
         st.info("Note: Add 'Return' and 'Ticker' columns in your dataset for stock-specific suggestions.")
@@ -231,20 +350,16 @@ with tab2:
     
     # --- Market Summary for Selected Date ---
     st.subheader(f"📊 Market Summary for {selected_date_str}")
-    selected_data = df[df['Date'] == selected_date].iloc[0]
+    pos = date_to_pos[selected_date_str]
 
-    # Extract key indicators dynamically
-    inflation = selected_data['Inflation Rate (%)']
-    gdp_growth = selected_data['GDP Growth (%)']
-    unemployment = selected_data['Unemployment Rate (%)']
-    interest_rate = selected_data['Interest Rate (%)']
+    # Extract key indicators straight from the precomputed NumPy columns
+    inflation = indicator_arrays['Inflation Rate (%)'][pos]
+    gdp_growth = indicator_arrays['GDP Growth (%)'][pos]
+    unemployment = indicator_arrays['Unemployment Rate (%)'][pos]
+    interest_rate = indicator_arrays['Interest Rate (%)'][pos]
 
     # Risk Indicator
-    risk_level = "Moderate"
-    if inflation > 5 or unemployment > 8 or interest_rate > 6:
-        risk_level = "High"
-    elif inflation < 2 and unemployment < 5 and interest_rate < 3:
-        risk_level = "Low"
+    risk_level = compute_risk_level(inflation, unemployment, interest_rate)
     st.markdown(f"**Market Risk Level on this date:** {risk_level}")
 
     # Diversification Tips
@@ -261,15 +376,18 @@ with tab2:
         st.write("- " + tip)
 
 # --- TAB 3: PORTFOLIO BUILDER ---
-with tab3:
+# A fragment: moving these sliders reruns only this function, not the whole app.
+# Slider values are keyed into session_state so Tab 4 can read them on a full rerun.
+@st.fragment
+def portfolio_builder():
     st.subheader("📊 Interactive Portfolio Allocation")
     st.markdown("### Set Your Target Allocations (%)")
     
     # Sliders
-    stocks = st.slider("Stocks", 0, 100, 50)
-    bonds = st.slider("Bonds", 0, 100, 30)
-    real_estate = st.slider("Real Estate", 0, 100, 10)
-    cash = st.slider("Cash", 0, 100, 10)
+    stocks = st.slider("Stocks", 0, 100, 50, key="alloc_stocks")
+    bonds = st.slider("Bonds", 0, 100, 30, key="alloc_bonds")
+    real_estate = st.slider("Real Estate", 0, 100, 10, key="alloc_real_estate")
+    cash = st.slider("Cash", 0, 100, 10, key="alloc_cash")
     
     total_alloc = stocks + bonds + real_estate + cash
     
@@ -282,10 +400,7 @@ with tab3:
         st.success("Total allocation is 100%.")
 
     # Risk Score & Performance (Simple rule-based example)
-    risk_score = (stocks * 0.6 + real_estate * 0.3 - bonds * 0.4 - cash * 0.5) / 100
-    risk_level = "High" if risk_score > 0.4 else "Medium" if risk_score > 0.15 else "Low"
-    expected_return = (stocks * 0.08 + bonds * 0.03 + real_estate * 0.06 + cash * 0.02) / 100
-    volatility = (stocks * 0.15 + bonds * 0.05 + real_estate * 0.1 + cash * 0.01) / 100
+    _, risk_level, expected_return, volatility = portfolio_profile(stocks, bonds, real_estate, cash)
 
     st.markdown("---")
     st.subheader("Portfolio Summary")
@@ -296,36 +411,30 @@ with tab3:
     col3.metric("Estimated Volatility", f"{volatility:.2%}")
 
     # Risk Alert
-    if risk_score > 0.4:
+    if risk_level == "High":
         st.error("⚠️ High Risk Alert: Your portfolio allocation is aggressive and may see high volatility.")
-    elif risk_score > 0.15:
+    elif risk_level == "Medium":
         st.warning("⚠️ Moderate Risk: Your portfolio is balanced but carries a moderate level of risk.")
     else:
         st.success("✅ Low Risk: Your portfolio is conservative and prioritizes capital preservation.")
 
     # Display as table and chart
-    alloc_df = pd.DataFrame({
-        "Asset Class": ["Stocks", "Bonds", "Real Estate", "Cash"],
-        "Allocation %": [stocks, bonds, real_estate, cash]
-    })
-    
-    pie_chart = alt.Chart(alloc_df).mark_arc(outerRadius=120).encode(
-        theta=alt.Theta(field="Allocation %", type="quantitative"),
-        color=alt.Color(field="Asset Class", type="nominal"),
-        tooltip=['Asset Class', 'Allocation %']
-    ).properties(title="Portfolio Allocation")
+    alloc_df = allocation_table(stocks, bonds, real_estate, cash)
     
-    st.altair_chart(pie_chart, use_container_width=True)
+    st.vega_lite_chart(alloc_df, ALLOCATION_PIE_SPEC, width="stretch")
 
     # Tax Efficiency
     st.subheader("Tax Efficiency Tips")
-    for tip in tax_efficiency_tips(alloc_df):
+    for tip in tax_efficiency_tips(stocks, bonds, real_estate, cash):
         st.info(tip)
         
     # Download Allocation
-    csv_data = alloc_df.to_csv(index=False).encode("utf-8")
+    csv_data = allocation_csv(stocks, bonds, real_estate, cash)
     st.download_button("💾 Download Allocation (CSV)", csv_data, "portfolio_allocation.csv", "text/csv")
 
+with tab3:
+    portfolio_builder()
+
 
 # --- TAB 4: REPORT & FEEDBACK ---
 with tab4:
@@ -333,32 +442,42 @@ with tab4:
     st.write("Click the button to generate a PDF summary of your goals and portfolio.")
     
     if st.button("Generate PDF Report"):
+        stocks = st.session_state["alloc_stocks"]
+        bonds = st.session_state["alloc_bonds"]
+        real_estate = st.session_state["alloc_real_estate"]
+        cash = st.session_state["alloc_cash"]
+        _, risk_level, expected_return, _ = portfolio_profile(stocks, bonds, real_estate, cash)
+
+        # Imported lazily so fpdf only loads when a report is requested
+        from fpdf import FPDF
+        from fpdf.enums import XPos, YPos
+
         pdf = FPDF()
         pdf.add_page()
-        pdf.set_font("Arial", 'B', size=16)
-        pdf.cell(200, 10, txt="My AI Financial Report", ln=True, align='C')
+        pdf.set_font("helvetica", 'B', size=16)
+        pdf.cell(200, 10, text="My AI Financial Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
         
-        pdf.set_font("Arial", 'B', size=12)
-        pdf.cell(200, 10, txt="My Financial Goal", ln=True)
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt=f"- {goal}", ln=True)
+        pdf.set_font("helvetica", 'B', size=12)
+        pdf.cell(200, 10, text="My Financial Goal", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("helvetica", size=12)
+        pdf.cell(200, 10, text=f"- {goal}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
-        pdf.set_font("Arial", 'B', size=12)
-        pdf.cell(200, 10, txt="My Portfolio Allocation", ln=True)
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 8, txt=f"- Stocks: {stocks}%", ln=True)
-        pdf.cell(200, 8, txt=f"- Bonds: {bonds}%", ln=True)
-        pdf.cell(200, 8, txt=f"- Real Estate: {real_estate}%", ln=True)
-        pdf.cell(200, 8, txt=f"- Cash: {cash}%", ln=True)
+        pdf.set_font("helvetica", 'B', size=12)
+        pdf.cell(200, 10, text="My Portfolio Allocation", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("helvetica", size=12)
+        pdf.cell(200, 8, text=f"- Stocks: {stocks}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(200, 8, text=f"- Bonds: {bonds}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(200, 8, text=f"- Real Estate: {real_estate}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(200, 8, text=f"- Cash: {cash}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
-        pdf.set_font("Arial", 'B', size=12)
-        pdf.cell(200, 10, txt="Portfolio Profile", ln=True)
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 8, txt=f"- Risk Level: {risk_level}", ln=True)
-        pdf.cell(200, 8, txt=f"- Expected Return: {expected_return:.2%}", ln=True)
-
-        # Output PDF as bytes
-        pdf_bytes = pdf.output(dest='S').encode('latin1')
+        pdf.set_font("helvetica", 'B', size=12)
+        pdf.cell(200, 10, text="Portfolio Profile", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("helvetica", size=12)
+        pdf.cell(200, 8, text=f"- Risk Level: {risk_level}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(200, 8, text=f"- Expected Return: {expected_return:.2%}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+        # Output PDF as bytes (fpdf2 returns a bytearray directly)
+        pdf_bytes = bytes(pdf.output())
         pdf_buffer = BytesIO(pdf_bytes)
 
         st.download_button(